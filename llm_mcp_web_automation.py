@@ -5,35 +5,56 @@ Interactive LLM-Driven Persona & Task Generation System
 User creates custom personas → LLM generates shopping tasks → Automated execution
 """
 
+import os
+import sys
 import time
+import argparse
+import asyncio
 import json
+import math
 import random
 import re
+import hashlib
+import threading
+import functools
+import shelve
+import importlib.util
+import tempfile
 from typing import Dict, List, Any
-from dataclasses import dataclass
+from dataclasses import dataclass, asdict, field
 from enum import Enum
+from types import MappingProxyType, SimpleNamespace
 
-# Selenium imports
-try:
+# Selenium and OpenAI are only checked for here and imported on first use,
+# so the CLI starts without paying their import cost.
+SELENIUM_AVAILABLE = importlib.util.find_spec("selenium") is not None
+if not SELENIUM_AVAILABLE:
+    print("⚠️ Install selenium: pip install selenium")
+
+OPENAI_AVAILABLE = importlib.util.find_spec("openai") is not None
+if not OPENAI_AVAILABLE:
+    print("⚠️ OpenAI not available - using rule-based decisions")
+
+
+@functools.lru_cache(maxsize=None)
+def _selenium():
+    """Imports Selenium on first use and returns the names TiraAutomation needs."""
     from selenium import webdriver
-    from selenium.webdriver.common.by import By
     from selenium.webdriver.common.keys import Keys
     from selenium.webdriver.support.ui import WebDriverWait
     from selenium.webdriver.support import expected_conditions as EC
     from selenium.webdriver.chrome.options import Options
     from selenium.webdriver.common.action_chains import ActionChains
-    SELENIUM_AVAILABLE = True
-except ImportError:
-    print("⚠️ Install selenium: pip install selenium")
-    SELENIUM_AVAILABLE = False
-
-# OpenAI imports
-try:
-    from openai import OpenAI
-    OPENAI_AVAILABLE = True
-except ImportError:
-    print("⚠️ OpenAI not available - using rule-based decisions")
-    OPENAI_AVAILABLE = False
+    from selenium.common.exceptions import TimeoutException
+    return SimpleNamespace(
+        webdriver=webdriver,
+        Keys=Keys,
+        WebDriverWait=WebDriverWait,
+        EC=EC,
+        Options=Options,
+        ActionChains=ActionChains,
+        TimeoutException=TimeoutException
+    )
 
 
 # ===========================================
@@ -68,6 +89,12 @@ class CustomPersona:
     shopping_goals: List[str]
     decision_style: str
     time_preference: str
+    messages: Dict[str, str] = field(init=False, repr=False)
+    traits_set: frozenset = field(init=False, repr=False)
+    
+    def __post_init__(self):
+        self.messages = PersonaCreator._build_messages(self.decision_style)
+        self.traits_set = frozenset(" ".join(self.personality_traits).lower().split())
 
 @dataclass
 class LLMTask:
@@ -77,6 +104,7 @@ class LLMTask:
     expected_functions: List[str]
     success_criteria: str
     emotional_journey: List[str]
+    search_term: str = ""
 
 @dataclass
 class AutomationStep:
@@ -86,6 +114,45 @@ class AutomationStep:
     emotional_state: EmotionalState
     parameters: Dict[str, Any] = None
 
+@dataclass(slots=True)
+class SessionStats:
+    """Tracks action outcomes and cart state across an automation session."""
+    actions: int = 0
+    success: int = 0
+    cart_items: int = 0
+    cart_total: int = 0
+    _lock: threading.Lock = field(default_factory=threading.Lock, init=False, repr=False, compare=False)
+    
+    def record(self, success: bool):
+        """Counts one action, and one success when it succeeded."""
+        with self._lock:
+            self.actions += 1
+            if success:
+                self.success += 1
+    
+    def add_cart_item(self, price: int):
+        """Counts one item added to the cart at the given price."""
+        with self._lock:
+            self.cart_items += 1
+            self.cart_total += price
+    
+    def remove_cart_item(self):
+        """Counts one item removed from the cart, never going below zero."""
+        with self._lock:
+            self.cart_items = max(0, self.cart_items - 1)
+    
+    def set_cart(self, total: int, items: int = None):
+        """Replaces the cart total, and the item count when given, with values read from the site."""
+        with self._lock:
+            self.cart_total = total
+            if items is not None:
+                self.cart_items = items
+    
+    @property
+    def success_rate(self) -> float:
+        """Fraction of recorded actions that succeeded, 0.0 before any action."""
+        return self.success / self.actions if self.actions else 0.0
+
 
 # ===========================================
 # VERIFIED SELECTORS
@@ -102,83 +169,160 @@ class TiraSelectors:
     PRODUCT_PRICES = "//p[@class='discount-price']"
     ADD_TO_BAG_HOVER = "//button[@class='add-to-bag__btn']"
     
+    # CSS selectors relative to a product card, resolved with querySelector
+    PRODUCT_NAME_REL = "div.product-name"
+    PRICE_REL = "p.discount-price"
+    
     PRODUCT_NAME_DETAIL = "//h1[@id='item_name']"
     ADD_TO_BAG_DETAIL = "(//button[@class='custom-btn primary lg no-tap-highlight'])[1]"
     
     CART_ITEMS = "//div[@class='bag']"
     REMOVE_BUTTON = "//div[@class='left']//button[1]"
     CART_URL = "https://www.tirabeauty.com/cart/bag"
+    HOME_URL = "https://www.tirabeauty.com/"
+    
+    # Pre-built (By.XPATH, selector) locators; "xpath" is the value of By.XPATH,
+    # spelled out so this class still loads when selenium is not installed.
+    SEARCH_INPUT_LOCATOR = ("xpath", SEARCH_INPUT)
+    PRODUCT_CARDS_LOCATOR = ("xpath", PRODUCT_CARDS)
+    CART_ITEMS_LOCATOR = ("xpath", CART_ITEMS)
+    REMOVE_BUTTON_LOCATOR = ("xpath", REMOVE_BUTTON)
 
 
 # ===========================================
 # SELENIUM FUNCTION CATALOG
 # ===========================================
 
+_CATALOG = {
+    "search_products": {
+        "description": "Search for products with persona-specific typing behavior",
+        "use_case": "Finding products, starting shopping journey",
+        "parameters": {"search_term": "string"},
+        "success_rate": "100%",
+        "persona_impact": "High"
+    },
+    "extract_products": {
+        "description": "Extract all visible products with names and prices",
+        "use_case": "Analyzing available products on current page",
+        "success_rate": "100%",
+        "persona_impact": "Low"
+    },
+    "hover_add_to_cart": {
+        "description": "Add product to cart using hover interaction",
+        "use_case": "Quick impulsive purchase from search results",
+        "parameters": {"product_index": "int (0-5)"},
+        "success_rate": "100%",
+        "persona_impact": "High"
+    },
+    "click_product_details": {
+        "description": "Click product to examine details with tab handling",
+        "use_case": "Careful examination before purchase",
+        "parameters": {"product_index": "int (0-5)"},
+        "success_rate": "100%",
+        "persona_impact": "High"
+    },
+    "add_from_details": {
+        "description": "Add to cart from product detail page",
+        "use_case": "Purchase after detailed examination",
+        "success_rate": "100%",
+        "persona_impact": "Medium"
+    },
+    "view_cart": {
+        "description": "Check shopping cart contents and total",
+        "use_case": "Reviewing purchases, budget checking",
+        "success_rate": "100%",
+        "persona_impact": "High"
+    },
+    "remove_from_cart": {
+        "description": "Remove item from cart",
+        "use_case": "Changing mind, budget concerns",
+        "success_rate": "95%",
+        "persona_impact": "High"
+    },
+    "complete_session": {
+        "description": "Finish shopping session with satisfaction",
+        "use_case": "When shopping goals are met",
+        "success_rate": "100%",
+        "persona_impact": "Medium"
+    }
+}
+
+# Catalog entries that InteractiveDemo._execute_task does not dispatch yet
+_UNEXECUTED_FUNCTIONS = frozenset({"click_product_details", "add_from_details"})
+
+# Only executable functions are offered to the model, serialized once with
+# sorted keys so the prompt bytes are identical on every call
+_CATALOG_PROMPT_BLOCK = json.dumps(
+    {name: spec for name, spec in _CATALOG.items() if name not in _UNEXECUTED_FUNCTIONS},
+    indent=2,
+    sort_keys=True
+)
+
+
 class SeleniumFunctions:
     """Catalog of available Selenium functions for LLM selection."""
     
     @staticmethod
     def get_catalog():
-        """Returns complete catalog of automation functions with metadata."""
-        return {
-            "search_products": {
-                "description": "Search for products with persona-specific typing behavior",
-                "use_case": "Finding products, starting shopping journey",
-                "parameters": {"search_term": "string"},
-                "success_rate": "100%",
-                "persona_impact": "High"
-            },
-            "extract_products": {
-                "description": "Extract all visible products with names and prices",
-                "use_case": "Analyzing available products on current page",
-                "success_rate": "100%",
-                "persona_impact": "Low"
-            },
-            "hover_add_to_cart": {
-                "description": "Add product to cart using hover interaction",
-                "use_case": "Quick impulsive purchase from search results",
-                "parameters": {"product_index": "int (0-5)"},
-                "success_rate": "100%",
-                "persona_impact": "High"
-            },
-            "click_product_details": {
-                "description": "Click product to examine details with tab handling",
-                "use_case": "Careful examination before purchase",
-                "parameters": {"product_index": "int (0-5)"},
-                "success_rate": "100%",
-                "persona_impact": "High"
-            },
-            "add_from_details": {
-                "description": "Add to cart from product detail page",
-                "use_case": "Purchase after detailed examination",
-                "success_rate": "100%",
-                "persona_impact": "Medium"
-            },
-            "view_cart": {
-                "description": "Check shopping cart contents and total",
-                "use_case": "Reviewing purchases, budget checking",
-                "success_rate": "100%",
-                "persona_impact": "High"
-            },
-            "remove_from_cart": {
-                "description": "Remove item from cart",
-                "use_case": "Changing mind, budget concerns",
-                "success_rate": "95%",
-                "persona_impact": "High"
-            },
-            "complete_session": {
-                "description": "Finish shopping session with satisfaction",
-                "use_case": "When shopping goals are met",
-                "success_rate": "100%",
-                "persona_impact": "Medium"
-            }
-        }
+        """Returns complete catalog of automation functions with metadata (shared, do not mutate)."""
+        return _CATALOG
 
 
 # ===========================================
 # PERSONA CREATION INTERFACE
 # ===========================================
 
+# Persona reaction templates, keyed by the automation step that prints them.
+# Styles only override the reactions that differ from the defaults.
+_DEFAULT_MESSAGES = MappingProxyType({
+    "search": "🤔 {name}: 'Hmm, maybe {term}?'",
+    "extract": "🤔 {name}: 'Let me analyze these {count} options...'",
+    "added": "✅ {name}: 'This looks good, adding to cart.'",
+    "cart_items": "😊 {name}: 'I have {items} items in my cart!'",
+    "cart_empty": "😊 {name}: 'I have {items} items in my cart!'",
+    "remove": "🤷 {name}: 'Changed my mind about this one.'",
+    "complete": "😊 {name}: 'Satisfied with my shopping choices!'"
+})
+
+_STYLE_MESSAGES = MappingProxyType({
+    "quick_impulsive": MappingProxyType({
+        "search": "⚡ {name}: 'Let me quickly find {term}!'",
+        "extract": "✨ {name}: 'Wow! {count} products to choose from!'",
+        "added": "🎉 {name}: 'YES! Adding {product} for ₹{price}!'",
+        "complete": "🎉 {name}: 'Great shopping session! Got everything I wanted!'"
+    }),
+    "research_heavy": MappingProxyType({
+        "search": "🔍 {name}: 'I need to carefully research {term}'"
+    }),
+    "price_focused": MappingProxyType({
+        "search": "💰 {name}: 'Looking for affordable {term}'",
+        "extract": "💰 {name}: 'Found {affordable} affordable options!'",
+        "added": "💰 {name}: 'Good deal at ₹{price}! Adding to cart.'",
+        "cart_items": "💰 {name}: 'Let me check if these {items} items fit my budget...'",
+        "cart_empty": "💰 {name}: 'Good, my cart is empty. Staying on budget!'",
+        "remove": "💰 {name}: 'This is too expensive for my budget. Removing.'",
+        "complete": "💰 {name}: 'Perfect! Stayed within budget and found good deals!'"
+    }),
+    "indecisive": MappingProxyType({
+        "cart_items": "😰 {name}: 'Oh no, I have {items} items. Do I really need all these?'",
+        "cart_empty": "😕 {name}: 'My cart is empty... maybe I should add something?'",
+        "remove": "🤔 {name}: 'Actually, I'm not sure I need this... removing it.'",
+        "complete": "😅 {name}: 'Finally made some decisions. I think I'm done... maybe.'"
+    })
+})
+
+# Groups are named after PersonaType members and tried in priority order, so
+# "trendy, budget" is still a budget shopper.
+_PERSONA_TYPE_RE = re.compile(
+    r'(?:.*?(?P<BUDGET_SHOPPER>budget|cheap|affordable|price)'
+    r'|.*?(?P<LUXURY_BUYER>luxury|premium|high-end|quality)'
+    r'|.*?(?P<INDECISIVE_SHOPPER>indecis|uncertain|changeable)'
+    r'|.*?(?P<BEAUTY_ENTHUSIAST>beauty|makeup|trendy|impulsive)'
+    r'|.*?(?P<SKINCARE_FOCUSED>skincare|routine|organic)'
+    r'|.*?(?P<GIFT_SHOPPER>gift|birthday|present))',
+    re.DOTALL
+)
+
 class PersonaCreator:
     """Handles interactive persona creation from user input."""
     
@@ -260,108 +404,414 @@ class PersonaCreator:
         
         return persona
     
+    @staticmethod
+    def _build_messages(decision_style):
+        """Resolves the persona's reaction templates for its decision style once."""
+        return {**_DEFAULT_MESSAGES, **_STYLE_MESSAGES.get(decision_style, {})}
+    
     @staticmethod
     def _determine_persona_type(traits, decision_style):
         """Automatically classifies persona type based on traits and decision style."""
-        trait_text = " ".join(traits).lower()
-        
-        if any(word in trait_text for word in ["budget", "cheap", "affordable", "price"]):
-            return PersonaType.BUDGET_SHOPPER
-        elif any(word in trait_text for word in ["luxury", "premium", "high-end", "quality"]):
-            return PersonaType.LUXURY_BUYER
-        elif any(word in trait_text for word in ["indecis", "uncertain", "changeable"]):
-            return PersonaType.INDECISIVE_SHOPPER
-        elif any(word in trait_text for word in ["beauty", "makeup", "trendy", "impulsive"]):
-            return PersonaType.BEAUTY_ENTHUSIAST
-        elif any(word in trait_text for word in ["skincare", "routine", "organic"]):
-            return PersonaType.SKINCARE_FOCUSED
-        elif any(word in trait_text for word in ["gift", "birthday", "present"]):
-            return PersonaType.GIFT_SHOPPER
-        else:
-            return PersonaType.CUSTOM
+        match = _PERSONA_TYPE_RE.match(" ".join(traits).lower())
+        return PersonaType[match.lastgroup] if match else PersonaType.CUSTOM
 
 
 # ===========================================
 # LLM TASK GENERATION ENGINE
 # ===========================================
 
+def _build_system_prompt():
+    """Builds the static task-generation instructions shared by every persona.
+
+    Everything here is identical across calls so OpenAI's automatic prompt
+    caching can reuse it; persona details go last, in the user message.
+    """
+    return f"""You are a shopping workflow planner for automated browser sessions on Tira Beauty, an Indian beauty and skincare e-commerce site. You receive a shopper persona and design realistic shopping tasks that a Selenium automation engine will execute step by step on the live site.
+
+HOW TASKS ARE EXECUTED:
+- Each task is run independently, starting from the Tira Beauty homepage.
+- The functions listed in "expected_functions" are executed strictly in order.
+- Function names that are not in the catalog below are skipped.
+- "search_products" should normally come first, since product functions act on search results.
+- "extract_products" reads the visible products and their prices and must run before "hover_add_to_cart".
+- "view_cart" navigates to the cart page; "remove_from_cart" only works on the cart page.
+- "complete_session" ends the task immediately, so it may only appear last.
+
+HOW TO TAILOR TASKS TO THE PERSONA:
+- Respect the persona's budget range: price-focused shoppers check the cart and remove items that do not fit.
+- Quick, impulsive shoppers add products straight from search results with few steps.
+- Research-heavy and quality-focused shoppers compare the extracted products and review the cart before committing.
+- Indecisive shoppers add items, review the cart, and change their mind.
+- Base every task on the persona's interests and shopping goals.
+- Give every task a short "search_term" (2-4 words) that this persona would type, such as "affordable matte lipstick".
+- Use emotions from this list for "emotional_journey": excited, curious, frustrated, satisfied, anxious, confident.
+
+AVAILABLE FUNCTIONS (JSON catalog with descriptions, use cases and parameters):
+{_CATALOG_PROMPT_BLOCK}
+
+EXAMPLE: for a price-focused persona interested in lipstick with a ₹500-1500 budget, a good task is
+"Affordable Lipstick Hunt": search for affordable lipstick, extract the products, hover-add the first
+product, view the cart to check the total against the budget and remove the item if it does not fit.
+Its expected_functions are ["search_products", "extract_products", "hover_add_to_cart", "view_cart", "remove_from_cart"],
+its search_term is "affordable matte lipstick", its success_criteria is "Cart total stays within ₹1500"
+and its emotional_journey is ["curious", "anxious", "satisfied"].
+
+For a quick, impulsive persona interested in trendy makeup, a good task is "Trendy Blush Grab": search
+for a trending blush, extract the products and hover-add the first one without reviewing the cart.
+Its expected_functions are ["search_products", "extract_products", "hover_add_to_cart", "complete_session"],
+its search_term is "trending cream blush", its success_criteria is "One blush added in under a minute"
+and its emotional_journey is ["excited", "confident"].
+
+Return valid JSON only, with no commentary, in exactly this format:
+{{
+    "tasks": [
+        {{
+            "task_name": "descriptive name",
+            "description": "what persona wants to accomplish",
+            "expected_functions": ["function1", "function2"],
+            "search_term": "what this persona types into the search box",
+            "success_criteria": "how to measure success",
+            "emotional_journey": ["emotion1", "emotion2"]
+        }}
+    ]
+}}"""
+
+
+_SYSTEM_PROMPT = _build_system_prompt()
+
+# Part of every task cache key, so entries from an older prompt are not replayed
+_PROMPT_VERSION = hashlib.blake2b(_SYSTEM_PROMPT.encode(), digest_size=8).hexdigest()
+
+
+class _JsonObjectScanner:
+    """Tracks brace depth over streamed text to detect when objects in a root-level array close."""
+    
+    def __init__(self, array_key):
+        self.array_key = array_key
+        self.chars = []
+        self.starts = []
+        self.children = []
+        self.depth = 0
+        self.root_brackets = 0
+        self.string_start = 0
+        self.last_string = None
+        self.root_key = None
+        self.in_string = False
+        self.escaped = False
+        self.complete = False
+    
+    def pop_children(self):
+        """Returns the objects in the outermost object's array_key array closed since the last call."""
+        children, self.children = self.children, []
+        return children
+    
+    def feed(self, content):
+        """Consumes streamed text and returns True once the outermost object has closed."""
+        for char in content:
+            if self.complete:
+                break
+            if not self.chars and char != '{':
+                continue
+            self.chars.append(char)
+            # Keys and arrays directly inside the outermost object
+            at_root = self.depth == 1 and self.root_brackets == 0
+            
+            if self.in_string:
+                if self.escaped:
+                    self.escaped = False
+                elif char == '\\':
+                    self.escaped = True
+                elif char == '"':
+                    self.in_string = False
+                    if at_root:
+                        self.last_string = "".join(self.chars[self.string_start:-1])
+            elif char == '"':
+                self.in_string = True
+                self.string_start = len(self.chars)
+            elif char == ':' and at_root:
+                self.root_key = self.last_string
+            elif char in '[]' and self.depth == 1:
+                self.root_brackets += 1 if char == '[' else -1
+            elif char == '{':
+                self.starts.append(len(self.chars) - 1)
+                self.depth += 1
+            elif char == '}':
+                start = self.starts.pop()
+                self.depth -= 1
+                if self.depth == 1 and self.root_brackets == 1 and self.root_key == self.array_key:
+                    self.children.append("".join(self.chars[start:]))
+                self.complete = self.depth == 0
+        
+        return self.complete
+
+
+TASK_CACHE_PATH = os.path.join(os.path.expanduser("~"), ".cache", "llm_mcp", "tasks.db")
+EMBEDDING_MODEL = "text-embedding-3-small"
+SEMANTIC_MATCH_THRESHOLD = 0.95
+
+# The OpenAI SDK retries 429s, 5xx responses and connection errors with
+# exponential backoff and jitter (honouring Retry-After); allow more attempts
+# than its default of 2 so transient spikes don't drop us to the fallback.
+OPENAI_MAX_RETRIES = 5
+
+_openai_client = None
+_openai_client_lock = threading.Lock()
+
+
+def get_openai_client():
+    """Returns the shared OpenAI client for OPENAI_API_KEY, creating it with a pooled HTTP client."""
+    global _openai_client
+    with _openai_client_lock:
+        if _openai_client is None:
+            # httpx ships as a dependency of the openai package
+            import httpx
+            from openai import DefaultHttpxClient, OpenAI
+            _openai_client = OpenAI(
+                api_key=os.environ['OPENAI_API_KEY'],
+                max_retries=OPENAI_MAX_RETRIES,
+                http_client=DefaultHttpxClient(
+                    limits=httpx.Limits(max_connections=50, max_keepalive_connections=20),
+                    timeout=httpx.Timeout(60.0, connect=5.0)
+                )
+            )
+        return _openai_client
+
+
 class TaskGenerationEngine:
     """Generates intelligent shopping workflows using LLM or rule-based fallback."""
     
-    def __init__(self, openai_client=None):
+    def __init__(self, openai_client=None, model="gpt-4o-mini", max_tokens=600,
+                 cache_path=TASK_CACHE_PATH, semantic_cache=False):
         self.openai_client = openai_client
-        self.functions = SeleniumFunctions.get_catalog()
+        self.model = model
+        self.max_tokens = max_tokens
+        self.cache_path = cache_path
+        self.semantic_cache = semantic_cache
+        self._embeddings = {}
     
     def generate_shopping_tasks(self, persona: CustomPersona) -> List[LLMTask]:
         """Creates complete shopping workflow tailored to persona characteristics."""
+        return list(self.stream_shopping_tasks(persona))
+    
+    def stream_shopping_tasks(self, persona: CustomPersona):
+        """Yields the persona's shopping tasks one by one, as soon as each is available."""
         if self.openai_client and OPENAI_AVAILABLE:
-            return self._llm_generate_tasks(persona)
+            cached_tasks = self._lookup_cached_tasks(persona)
+            if cached_tasks:
+                yield from cached_tasks
+            else:
+                yield from self._llm_generate_tasks(persona)
         else:
-            return self._rule_generate_tasks(persona)
+            yield from self._rule_generate_tasks(persona)
     
-    def _llm_generate_tasks(self, persona: CustomPersona) -> List[LLMTask]:
-        """Uses LLM to create intelligent, persona-specific shopping tasks."""
-        function_list = [f"• {name}: {info['description']}" for name, info in self.functions.items()]
-        
-        prompt = f"""Create 2-3 realistic shopping tasks for this persona:
+    @staticmethod
+    def _persona_block(persona: CustomPersona) -> str:
+        """Formats the persona-specific part of the prompt, sent after the shared system prompt."""
+        return f"""Create 2-3 realistic shopping tasks for this persona:
 
 PERSONA: {persona.name}
 - Budget: ₹{persona.budget_range[0]}-{persona.budget_range[1]}
 - Traits: {', '.join(persona.personality_traits)}
 - Interests: {', '.join(persona.interests)}
 - Goals: {', '.join(persona.shopping_goals)}
-- Style: {persona.decision_style}
-
-AVAILABLE FUNCTIONS:
-{chr(10).join(function_list)}
-
-Return JSON:
-{{
-    "tasks": [
-        {{
-            "task_name": "descriptive name",
-            "description": "what persona wants to accomplish",
-            "expected_functions": ["function1", "function2"],
-            "success_criteria": "how to measure success",
-            "emotional_journey": ["emotion1", "emotion2"]
-        }}
-    ]
-}}"""
-
+- Style: {persona.decision_style}"""
+    
+    def _llm_generate_tasks(self, persona: CustomPersona):
+        """Uses LLM to create intelligent, persona-specific shopping tasks, yielding each as it streams in."""
+        messages = [
+            {"role": "system", "content": _SYSTEM_PROMPT},
+            {"role": "user", "content": self._persona_block(persona)}
+        ]
+        
+        tasks = []
         try:
-            response = self.openai_client.chat.completions.create(
-                model="gpt-4",
-                messages=[
-                    {"role": "system", "content": "Create realistic shopping tasks. Return valid JSON only."},
-                    {"role": "user", "content": prompt}
-                ],
-                temperature=0.7,
-                max_tokens=600
-            )
+            try:
+                for task in self._stream_tasks(messages):
+                    tasks.append(task)
+                    yield task
+            except Exception as e:
+                if tasks:
+                    # The tasks already shown are this session's list; a partial list is never cached
+                    print(f"⚠️ Task stream cut short after {len(tasks)} task(s): {e}")
+                    return
+                print(f"⚠️ Task stream failed, retrying without streaming: {e}")
             
-            response_text = response.choices[0].message.content
-            json_match = re.search(r'\{.*\}', response_text, re.DOTALL)
+            if not tasks:
+                data = self._request_task_json(messages)
+                tasks = [self._task_from_dict(task_data) for task_data in data.get('tasks', [])]
+                yield from tasks
             
-            if json_match:
-                data = json.loads(json_match.group())
-                tasks = []
-                
-                for task_data in data.get('tasks', []):
-                    task = LLMTask(
-                        task_name=task_data.get('task_name', 'Shopping Task'),
-                        description=task_data.get('description', 'Complete shopping goal'),
-                        expected_functions=task_data.get('expected_functions', ['search_products']),
-                        success_criteria=task_data.get('success_criteria', 'Task completed'),
-                        emotional_journey=task_data.get('emotional_journey', ['curious'])
-                    )
-                    tasks.append(task)
-                
-                return tasks
+            self._store_cached_tasks(persona, tasks)
             
         except Exception as e:
             print(f"⚠️ LLM task generation failed: {e}")
         
-        return self._rule_generate_tasks(persona)
+        if not tasks:
+            yield from self._rule_generate_tasks(persona)
+    
+    def _stream_tasks(self, messages):
+        """Streams the completion, yielding each task object as soon as it closes."""
+        scanner = _JsonObjectScanner('tasks')
+        stream = self.openai_client.chat.completions.create(
+            model=self.model,
+            messages=messages,
+            temperature=0.7,
+            max_tokens=self.max_tokens,
+            response_format={"type": "json_object"},
+            stream=True,
+            stream_options={"include_usage": True}
+        )
+        
+        try:
+            for chunk in stream:
+                # The final chunk has no choices and carries the usage for the whole request
+                if not chunk.choices:
+                    self._log_prompt_cache(chunk)
+                    continue
+                scanner.feed(chunk.choices[0].delta.content or "")
+                for task_json in scanner.pop_children():
+                    yield self._task_from_dict(json.loads(task_json))
+            
+            # Cut off by max_tokens or a dropped connection; the caller must not cache this
+            if not scanner.complete:
+                raise ValueError("stream ended before the task list was complete")
+        finally:
+            stream.close()
+    
+    def _request_task_json(self, messages):
+        """Blocking fallback that parses the JSON object from a full completion."""
+        response = self.openai_client.chat.completions.create(
+            model=self.model,
+            messages=messages,
+            temperature=0.7,
+            max_tokens=self.max_tokens,
+            response_format={"type": "json_object"}
+        )
+        self._log_prompt_cache(response)
+        
+        return json.loads(response.choices[0].message.content)
+    
+    @staticmethod
+    def _log_prompt_cache(response):
+        """Reports how many prompt tokens were served from OpenAI's prompt cache."""
+        usage = getattr(response, 'usage', None)
+        details = getattr(usage, 'prompt_tokens_details', None)
+        cached_tokens = getattr(details, 'cached_tokens', None)
+        if cached_tokens is not None:
+            print(f"⚡ Prompt cache: {cached_tokens}/{usage.prompt_tokens} prompt tokens cached")
+    
+    @staticmethod
+    def _task_from_dict(task_data) -> LLMTask:
+        """Builds an LLMTask from LLM or cached JSON, filling in missing fields."""
+        return LLMTask(
+            task_name=task_data.get('task_name', 'Shopping Task'),
+            description=task_data.get('description', 'Complete shopping goal'),
+            expected_functions=task_data.get('expected_functions', ['search_products']),
+            success_criteria=task_data.get('success_criteria', 'Task completed'),
+            emotional_journey=task_data.get('emotional_journey', ['curious']),
+            search_term=task_data.get('search_term', '')
+        )
+    
+    @staticmethod
+    def _persona_fingerprint(persona: CustomPersona) -> str:
+        """Returns a stable cache key for the persona attributes that shape its tasks."""
+        profile = {
+            "traits": sorted(persona.personality_traits),
+            "goals": sorted(persona.shopping_goals),
+            "style": persona.decision_style,
+            "budget": list(persona.budget_range),
+            "interests": sorted(persona.interests)
+        }
+        return hashlib.blake2b(json.dumps(profile, sort_keys=True).encode()).hexdigest()
+    
+    def _cache_key_prefix(self) -> str:
+        """Scopes cache entries to the model and prompt version that produced them."""
+        return f"{self.model}:{_PROMPT_VERSION}:"
+    
+    def _cache_key(self, persona: CustomPersona) -> str:
+        """Returns the task cache key for this persona under the current model and prompt."""
+        return self._cache_key_prefix() + self._persona_fingerprint(persona)
+    
+    def _lookup_cached_tasks(self, persona: CustomPersona) -> List[LLMTask]:
+        """Returns previously generated tasks for this or a near-identical persona."""
+        if not self.cache_path:
+            return []
+        
+        key = self._cache_key(persona)
+        try:
+            with self._open_cache() as cache:
+                entry = cache.get(key)
+            
+            if entry is None and self.semantic_cache:
+                # Embed before opening the shelve so the network call doesn't hold it open
+                embedding = self._embed_persona(persona)
+                with self._open_cache() as cache:
+                    entry = self._closest_cached_entry(embedding, cache)
+        except Exception as e:
+            print(f"⚠️ Task cache unavailable: {e}")
+            return []
+        
+        if entry is None:
+            return []
+        
+        print(f"💾 Reusing cached tasks for {persona.name}")
+        return [self._task_from_dict(task_data) for task_data in entry['tasks']]
+    
+    def _open_cache(self):
+        """Opens the on-disk task cache, creating its directory on first use."""
+        os.makedirs(os.path.dirname(self.cache_path) or ".", exist_ok=True)
+        return shelve.open(self.cache_path)
+    
+    def _closest_cached_entry(self, embedding: List[float], cache):
+        """Finds the current-prompt entry whose persona embedding is most similar, if close enough."""
+        prefix = self._cache_key_prefix()
+        best_entry, best_score = None, SEMANTIC_MATCH_THRESHOLD
+        
+        for key in cache.keys():
+            if not key.startswith(prefix):
+                continue
+            entry = cache[key]
+            if entry.get('embedding'):
+                score = self._cosine_similarity(embedding, entry['embedding'])
+                if score >= best_score:
+                    best_entry, best_score = entry, score
+        
+        return best_entry
+    
+    def _store_cached_tasks(self, persona: CustomPersona, tasks: List[LLMTask]):
+        """Persists generated tasks under the persona cache key for later runs."""
+        if not self.cache_path or not tasks:
+            return
+        
+        try:
+            embedding = self._embed_persona(persona) if self.semantic_cache else None
+            with self._open_cache() as cache:
+                cache[self._cache_key(persona)] = {
+                    'tasks': [asdict(task) for task in tasks],
+                    'embedding': embedding
+                }
+        except Exception as e:
+            print(f"⚠️ Could not cache tasks: {e}")
+    
+    def _embed_persona(self, persona: CustomPersona) -> List[float]:
+        """Embeds a persona summary for semantic cache matching, once per fingerprint."""
+        key = self._persona_fingerprint(persona)
+        if key not in self._embeddings:
+            summary = (f"Traits: {', '.join(sorted(persona.personality_traits))}. "
+                       f"Goals: {', '.join(sorted(persona.shopping_goals))}. "
+                       f"Style: {persona.decision_style}. "
+                       f"Budget: ₹{persona.budget_range[0]}-{persona.budget_range[1]}. "
+                       f"Interests: {', '.join(sorted(persona.interests))}.")
+            response = self.openai_client.embeddings.create(model=EMBEDDING_MODEL, input=summary)
+            self._embeddings[key] = response.data[0].embedding
+        return self._embeddings[key]
+    
+    @staticmethod
+    def _cosine_similarity(a, b):
+        """Computes cosine similarity between two embedding vectors."""
+        dot = sum(x * y for x, y in zip(a, b))
+        norm = math.sqrt(sum(x * x for x in a)) * math.sqrt(sum(y * y for y in b))
+        return dot / norm if norm else 0.0
     
     def _rule_generate_tasks(self, persona: CustomPersona) -> List[LLMTask]:
         """Fallback rule-based task generation when LLM unavailable."""
@@ -400,47 +850,128 @@ Return JSON:
 # ENHANCED AUTOMATION ENGINE
 # ===========================================
 
+_PRICE_RE = re.compile(r'₹\s*(\d+(?:,\d+)*)')
+
+# Checked in priority order: a URL mentioning both "search" and "product"
+# is still a search results page.
+_PAGE_TYPE_RE = re.compile(
+    r'(?:.*?(?P<search_results>search)'
+    r'|.*?(?P<product_details>product)'
+    r'|.*?(?P<cart>cart|bag))'
+)
+
+# Reads up to arguments[1] visible product cards matching the XPath in
+# arguments[0] in one WebDriver round-trip; arguments[2] and arguments[3] are
+# the card-relative name and price CSS selectors. Card elements come back as WebElements.
+_EXTRACT_PRODUCTS_JS = """
+const cards = document.evaluate(arguments[0], document, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+const products = [];
+for (let i = 0; i < cards.snapshotLength && products.length < arguments[1]; i++) {
+    const card = cards.snapshotItem(i);
+    if (card.offsetParent === null) continue;
+    const name = card.querySelector(arguments[2]);
+    const price = card.querySelector(arguments[3]);
+    products.push({
+        element: card,
+        name: name ? name.innerText : null,
+        price: price ? price.innerText : null
+    });
+}
+return products;
+"""
+
+# Returns the first element matching the XPath in arguments[0] that is rendered
+# and not hidden, or null, in a single round-trip.
+_FIRST_VISIBLE_JS = """
+const matches = document.evaluate(arguments[0], document, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+for (let i = 0; i < matches.snapshotLength; i++) {
+    const element = matches.snapshotItem(i);
+    const rect = element.getBoundingClientRect();
+    if (rect.width > 0 && rect.height > 0 && getComputedStyle(element).visibility !== 'hidden') {
+        return element;
+    }
+}
+return null;
+"""
+
+# Reads every cart item matching the XPath in arguments[0] in one round-trip,
+# preferring the price element matching the CSS selector in arguments[1].
+# That selector is only verified on product cards, so cart prices are
+# best-effort and reported for information, never used to gate actions.
+_CART_JS = """
+const items = document.evaluate(arguments[0], document, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+const snapshot = [];
+for (let i = 0; i < items.snapshotLength; i++) {
+    const item = items.snapshotItem(i);
+    const price = item.querySelector(arguments[1]);
+    snapshot.push({text: item.innerText, price: price ? price.innerText : item.innerText});
+}
+return snapshot;
+"""
+
 class TiraAutomation:
     """Handles all Selenium automation with persona-aware behavior."""
     
-    def __init__(self):
+    SHORT_TIMEOUT = 3
+    SETTLE_DELAY = 0.3
+    DEFAULT_PROFILE_DIR = os.path.join(tempfile.gettempdir(), "tira_profile")
+    
+    def __init__(self, profile_dir=None):
+        self.profile_dir = profile_dir
         self.driver = None
-        self.wait = None
+        self.home_url = TiraSelectors.HOME_URL
+        self.actions = None
+        self.wait_short = None
+        self.wait_long = None
         self.current_products = []
-        self.stats = {'actions': 0, 'success': 0, 'cart_items': 0}
+        self.stats = SessionStats()
         
     def setup_browser(self):
         """Initializes Chrome browser with optimal settings for automation."""
-        options = Options()
+        selenium = _selenium()
+        options = selenium.Options()
         options.add_argument("--window-size=1400,1000")
         options.add_argument("--disable-blink-features=AutomationControlled")
+        options.add_argument("--disable-dev-shm-usage")
+        options.add_argument("--disable-extensions")
+        if hasattr(os, "geteuid") and os.geteuid() == 0:
+            # Chrome refuses to start its sandbox as root, e.g. inside containers
+            options.add_argument("--no-sandbox")
+        if self.profile_dir:
+            # Opt-in persistent profile keeps the HTTP cache and cookies warm across
+            # runs; Chrome locks it, so only one session can use it at a time
+            options.add_argument(f"--user-data-dir={self.profile_dir}")
+        options.add_experimental_option("prefs", {"profile.managed_default_content_settings.images": 2})
+        options.page_load_strategy = 'eager'
         
-        self.driver = webdriver.Chrome(options=options)
-        self.wait = WebDriverWait(self.driver, 10)
+        self.driver = selenium.webdriver.Chrome(options=options)
+        self.actions = selenium.ActionChains(self.driver)
+        self.wait_short = selenium.WebDriverWait(self.driver, self.SHORT_TIMEOUT)
+        self.wait_long = selenium.WebDriverWait(self.driver, 10)
         
-        self.driver.get("https://www.tirabeauty.com/")
-        time.sleep(3)
+        if self.profile_dir:
+            self._sync_cart_stats()
+        
+        self.driver.get(TiraSelectors.HOME_URL)
+        self._wait_for(selenium.EC.presence_of_element_located(TiraSelectors.SEARCH_INPUT_LOCATOR))
+        self.home_url = self.driver.current_url
         print("🔧 Browser ready")
     
     def search_products(self, persona: CustomPersona, search_term: str):
         """Performs product search with persona-specific typing behavior and reactions."""
         print(f"🔍 {persona.name} searching: '{search_term}'")
         try:
-            search_input = self.wait.until(EC.element_to_be_clickable((By.XPATH, TiraSelectors.SEARCH_INPUT)))
+            search_input = self.wait_long.until(_selenium().EC.element_to_be_clickable(TiraSelectors.SEARCH_INPUT_LOCATOR))
             search_input.clear()
+            old_cards = self.driver.find_elements(*TiraSelectors.PRODUCT_CARDS_LOCATOR)
             
-            if persona.decision_style == "quick_impulsive":
-                print(f"⚡ {persona.name}: 'Let me quickly find {search_term}!'")
-            elif persona.decision_style == "research_heavy":
-                print(f"🔍 {persona.name}: 'I need to carefully research {search_term}'")
-            elif persona.decision_style == "price_focused":
-                print(f"💰 {persona.name}: 'Looking for affordable {search_term}'")
-            else:
-                print(f"🤔 {persona.name}: 'Hmm, maybe {search_term}?'")
+            print(persona.messages["search"].format(name=persona.name, term=search_term))
             
             search_input.send_keys(search_term)
-            search_input.send_keys(Keys.RETURN)
-            time.sleep(3)
+            search_input.send_keys(_selenium().Keys.RETURN)
+            if old_cards:
+                self._wait_for(_selenium().EC.staleness_of(old_cards[0]), self.wait_short)
+            self._wait_for(_selenium().EC.presence_of_all_elements_located(TiraSelectors.PRODUCT_CARDS_LOCATOR))
             
             self._update_stats(True)
             return {'success': True}
@@ -452,35 +983,26 @@ class TiraAutomation:
         """Extracts product information from current page with persona reactions."""
         print("📦 Extracting products...")
         try:
-            cards = self.driver.find_elements(By.XPATH, TiraSelectors.PRODUCT_CARDS)
-            visible_cards = [c for c in cards if c.is_displayed()][:6]
+            cards = self.driver.execute_script(_EXTRACT_PRODUCTS_JS, TiraSelectors.PRODUCT_CARDS, 6,
+                                               TiraSelectors.PRODUCT_NAME_REL, TiraSelectors.PRICE_REL)
             
             products = []
-            for i, card in enumerate(visible_cards):
-                try:
-                    name_elem = card.find_element(By.XPATH, ".//div[@class='product-name']")
-                    name = name_elem.text.strip()[:50] + "..."
-                    
-                    price_elem = card.find_element(By.XPATH, ".//p[@class='discount-price']")
-                    price_text = price_elem.text.strip()
-                    price_match = re.search(r'₹\s*(\d+(?:,\d+)*)', price_text)
-                    price = int(price_match.group(1).replace(',', '')) if price_match else 0
-                    
-                    products.append({'name': name, 'price': price, 'element': card, 'index': i})
-                    print(f"  📦 {name} - ₹{price}")
-                except:
+            for i, card in enumerate(cards):
+                if card['name'] is None or card['price'] is None:
                     continue
+                
+                name = card['name'].strip()[:50] + "..."
+                price_match = _PRICE_RE.search(card['price'].strip())
+                price = int(price_match.group(1).replace(',', '')) if price_match else 0
+                
+                products.append({'name': name, 'price': price, 'element': card['element'], 'index': i})
+                print(f"  📦 {name} - ₹{price}")
             
             self.current_products = products
             
             if persona and products:
-                if persona.decision_style == "price_focused":
-                    affordable = [p for p in products if p['price'] <= persona.budget_range[1] * 0.7]
-                    print(f"💰 {persona.name}: 'Found {len(affordable)} affordable options!'")
-                elif persona.decision_style == "quick_impulsive":
-                    print(f"✨ {persona.name}: 'Wow! {len(products)} products to choose from!'")
-                else:
-                    print(f"🤔 {persona.name}: 'Let me analyze these {len(products)} options...'")
+                affordable = sum(1 for p in products if p['price'] <= persona.budget_range[1] * 0.7)
+                print(persona.messages["extract"].format(name=persona.name, count=len(products), affordable=affordable))
             
             return {'success': True, 'products': products, 'count': len(products)}
             
@@ -503,27 +1025,22 @@ class TiraAutomation:
             element = product['element']
             
             self.driver.execute_script("arguments[0].scrollIntoView({block: 'center'});", element)
-            time.sleep(1)
-            
-            actions = ActionChains(self.driver)
-            actions.move_to_element(element).perform()
-            time.sleep(2)
+            time.sleep(self.SETTLE_DELAY)
             
-            add_buttons = self.driver.find_elements(By.XPATH, TiraSelectors.ADD_TO_BAG_HOVER)
-            visible_btn = next((btn for btn in add_buttons if btn.is_displayed()), None)
+            self.actions.reset_actions()
+            self.actions.move_to_element(element).perform()
+            visible_btn = self._wait_for(
+                lambda driver: driver.execute_script(_FIRST_VISIBLE_JS, TiraSelectors.ADD_TO_BAG_HOVER),
+                self.wait_short
+            )
             
             if visible_btn:
                 visible_btn.click()
-                time.sleep(2)
+                self._wait_for(_selenium().EC.invisibility_of_element(visible_btn), self.wait_short)
                 
-                if persona.decision_style == "quick_impulsive":
-                    print(f"🎉 {persona.name}: 'YES! Adding {product['name']} for ₹{product['price']}!'")
-                elif persona.decision_style == "price_focused":
-                    print(f"💰 {persona.name}: 'Good deal at ₹{product['price']}! Adding to cart.'")
-                else:
-                    print(f"✅ {persona.name}: 'This looks good, adding to cart.'")
+                print(persona.messages["added"].format(name=persona.name, product=product['name'], price=product['price']))
                 
-                self.stats['cart_items'] += 1
+                self.stats.add_cart_item(product['price'])
                 self._update_stats(True)
                 return {'success': True}
             else:
@@ -539,26 +1056,16 @@ class TiraAutomation:
         print(f"🛒 {persona.name} checking cart")
         try:
             self.driver.get(TiraSelectors.CART_URL)
-            time.sleep(3)
+            self._wait_for(_selenium().EC.presence_of_element_located(TiraSelectors.CART_ITEMS_LOCATOR), self.wait_short)
             
-            items = self.driver.find_elements(By.XPATH, TiraSelectors.CART_ITEMS)
-            item_count = len(items)
+            snapshot = self._snapshot_cart()
+            item_count = snapshot['count']
             
-            if persona.decision_style == "price_focused":
-                if item_count > 0:
-                    print(f"💰 {persona.name}: 'Let me check if these {item_count} items fit my budget...'")
-                else:
-                    print(f"💰 {persona.name}: 'Good, my cart is empty. Staying on budget!'")
-            elif persona.decision_style == "indecisive":
-                if item_count > 0:
-                    print(f"😰 {persona.name}: 'Oh no, I have {item_count} items. Do I really need all these?'")
-                else:
-                    print(f"😕 {persona.name}: 'My cart is empty... maybe I should add something?'")
-            else:
-                print(f"😊 {persona.name}: 'I have {item_count} items in my cart!'")
+            key = "cart_items" if item_count > 0 else "cart_empty"
+            print(persona.messages[key].format(name=persona.name, items=item_count))
             
             self._update_stats(True)
-            return {'success': True, 'item_count': item_count}
+            return {'success': True, 'item_count': item_count, 'total': snapshot['total'], 'items': snapshot['items']}
             
         except Exception as e:
             self._update_stats(False)
@@ -568,20 +1075,16 @@ class TiraAutomation:
         """Removes item from cart with persona-appropriate reasoning."""
         print(f"🗑️ {persona.name} removing item")
         try:
-            remove_btns = self.driver.find_elements(By.XPATH, TiraSelectors.REMOVE_BUTTON)
+            remove_btns = self.driver.find_elements(*TiraSelectors.REMOVE_BUTTON_LOCATOR)
             
             if remove_btns:
-                if persona.decision_style == "indecisive":
-                    print(f"🤔 {persona.name}: 'Actually, I'm not sure I need this... removing it.'")
-                elif persona.decision_style == "price_focused":
-                    print(f"💰 {persona.name}: 'This is too expensive for my budget. Removing.'")
-                else:
-                    print(f"🤷 {persona.name}: 'Changed my mind about this one.'")
+                print(persona.messages["remove"].format(name=persona.name))
                 
                 remove_btns[0].click()
-                time.sleep(2)
+                self._wait_for(_selenium().EC.staleness_of(remove_btns[0]), self.wait_short)
                 
-                self.stats['cart_items'] = max(0, self.stats['cart_items'] - 1)
+                self.stats.remove_cart_item()
+                self._snapshot_cart()
                 self._update_stats(True)
                 return {'success': True}
             else:
@@ -593,42 +1096,67 @@ class TiraAutomation:
     
     def complete_session(self, persona: CustomPersona):
         """Completes shopping session with persona-appropriate satisfaction message."""
-        if persona.decision_style == "quick_impulsive":
-            print(f"🎉 {persona.name}: 'Great shopping session! Got everything I wanted!'")
-        elif persona.decision_style == "price_focused":
-            print(f"💰 {persona.name}: 'Perfect! Stayed within budget and found good deals!'")
-        elif persona.decision_style == "indecisive":
-            print(f"😅 {persona.name}: 'Finally made some decisions. I think I'm done... maybe.'")
-        else:
-            print(f"😊 {persona.name}: 'Satisfied with my shopping choices!'")
+        print(persona.messages["complete"].format(name=persona.name))
         
         return {'success': True}
     
     def get_context(self):
         """Returns current browser context for LLM decision making."""
-        url = self.driver.current_url.lower()
-        
-        if 'search' in url:
-            page_type = 'search_results'
-        elif 'product' in url:
-            page_type = 'product_details'
-        elif 'cart' in url or 'bag' in url:
-            page_type = 'cart'
-        else:
-            page_type = 'homepage'
+        match = _PAGE_TYPE_RE.match(self.driver.current_url.lower())
+        page_type = match.lastgroup if match else 'homepage'
         
         return {
             'page_type': page_type,
             'products_available': len(self.current_products),
-            'cart_items': self.stats['cart_items'],
-            'actions_completed': self.stats['actions']
+            'cart_items': self.stats.cart_items,
+            'actions_completed': self.stats.actions
         }
     
+    def reset_for_next_task(self):
+        """Returns to the homepage between tasks, skipping the reload if already there."""
+        if self.driver.current_url.rstrip('/') == self.home_url.rstrip('/'):
+            return
+        
+        print("🔄 Returning to homepage for next task...")
+        self.driver.get(self.home_url)
+        self._wait_for(_selenium().EC.presence_of_element_located(TiraSelectors.SEARCH_INPUT_LOCATOR))
+    
+    def wait_for_page_ready(self):
+        """Waits until the current document has been parsed and is safe to query."""
+        self._wait_for(lambda driver: driver.execute_script("return document.readyState") != "loading")
+    
+    def _sync_cart_stats(self):
+        """Seeds cart stats from the site cart, which a reused profile may already have filled."""
+        self.driver.get(TiraSelectors.CART_URL)
+        self.wait_for_page_ready()
+        self._wait_for(_selenium().EC.presence_of_element_located(TiraSelectors.CART_ITEMS_LOCATOR), self.wait_short)
+        self._snapshot_cart()
+    
+    def _snapshot_cart(self):
+        """Reads cart items, prices and total in one script call and records the count and total."""
+        items = []
+        for entry in self.driver.execute_script(_CART_JS, TiraSelectors.CART_ITEMS, TiraSelectors.PRICE_REL):
+            lines = [line.strip() for line in entry['text'].splitlines() if line.strip()]
+            price_match = _PRICE_RE.search(entry['price'])
+            items.append({
+                'name': lines[0] if lines else '',
+                'price': int(price_match.group(1).replace(',', '')) if price_match else 0
+            })
+        
+        total = sum(item['price'] for item in items)
+        self.stats.set_cart(total, len(items))
+        return {'count': len(items), 'total': total, 'items': items}
+    
+    def _wait_for(self, condition, wait=None):
+        """Polls until condition holds, returning its value or None on timeout."""
+        try:
+            return (wait or self.wait_long).until(condition)
+        except _selenium().TimeoutException:
+            return None
+    
     def _update_stats(self, success):
         """Updates internal success statistics for session tracking."""
-        self.stats['actions'] += 1
-        if success:
-            self.stats['success'] += 1
+        self.stats.record(success)
     
     def cleanup(self):
         """Closes browser and cleans up resources."""
@@ -640,66 +1168,116 @@ class TiraAutomation:
 # DEMO ORCHESTRATOR
 # ===========================================
 
+# Search-term prefixes, checked in order: decision style, persona type, trait word
+_PREFIX_BY_STYLE = MappingProxyType({"price_focused": "affordable"})
+_PREFIX_BY_TYPE = MappingProxyType({PersonaType.LUXURY_BUYER: "premium"})
+_TRENDING_TOKEN = "trending"
+
+
+@functools.lru_cache(maxsize=None)
+def _search_term_profile(decision_style, persona_type, traits_set, interests, goals):
+    """Classifies a persona once into its search-term prefix and candidate terms."""
+    prefix = (_PREFIX_BY_STYLE.get(decision_style)
+              or _PREFIX_BY_TYPE.get(persona_type)
+              or (_TRENDING_TOKEN if any(_TRENDING_TOKEN in trait for trait in traits_set) else ""))
+    return prefix, interests + goals
+
+
 class InteractiveDemo:
     """Orchestrates complete demo flow from persona creation to task execution."""
     
-    def __init__(self, use_openai=True):
-        self.automation = TiraAutomation()
+    def __init__(self, use_openai=True, inter_action_delay=0.0, use_cache=True, semantic_cache=False,
+                 profile_dir=None):
+        self.automation = TiraAutomation(profile_dir)
+        # Optional pause between functions for watchable demos; page readiness
+        # is handled by explicit waits, so this defaults to no delay.
+        self.inter_action_delay = inter_action_delay
         
         openai_client = None
-        if use_openai and OPENAI_AVAILABLE:
-            import os
-            api_key = os.getenv('OPENAI_API_KEY')
-            if api_key:
-                openai_client = OpenAI(api_key=api_key)
-                print("🤖 LLM connected for task generation and execution")
+        if use_openai and OPENAI_AVAILABLE and os.getenv('OPENAI_API_KEY'):
+            openai_client = get_openai_client()
+            print("🤖 LLM connected for task generation and execution")
         
-        self.task_engine = TaskGenerationEngine(openai_client)
+        self.task_engine = TaskGenerationEngine(
+            openai_client,
+            cache_path=TASK_CACHE_PATH if use_cache else None,
+            semantic_cache=semantic_cache
+        )
     
     def run_interactive_session(self):
         """Executes complete workflow: persona creation → task generation → automation."""
-        print("🎭 INTERACTIVE LLM PERSONA & TASK GENERATION DEMO")
-        print("="*60)
-        print("🔥 User creates persona → LLM generates tasks → AI executes")
-        print("="*60)
+        self._emit(
+            "🎭 INTERACTIVE LLM PERSONA & TASK GENERATION DEMO",
+            "="*60,
+            "🔥 User creates persona → LLM generates tasks → AI executes",
+            "="*60
+        )
         
         persona = PersonaCreator.create_custom_persona()
         
         print(f"\n🤖 LLM GENERATING SHOPPING TASKS FOR {persona.name}...")
-        tasks = self.task_engine.generate_shopping_tasks(persona)
-        
-        print(f"\n📋 GENERATED {len(tasks)} TASKS:")
-        for i, task in enumerate(tasks, 1):
-            print(f"  {i}. {task.task_name}")
-            print(f"     📝 {task.description}")
-            print(f"     🔧 Functions: {', '.join(task.expected_functions)}")
-            print(f"     🎯 Success: {task.success_criteria}")
-            print(f"     😊 Journey: {' → '.join(task.emotional_journey)}")
-        
-        input(f"\n⏯️  Press Enter to start {persona.name}'s AI-driven shopping session...")
-        
-        self.automation.setup_browser()
-        
-        for i, task in enumerate(tasks, 1):
-            print(f"\n{'='*60}")
-            print(f"🎯 EXECUTING TASK {i}: {task.task_name}")
-            print(f"📝 Goal: {task.description}")
-            print(f"{'='*60}")
+        try:
+            tasks = asyncio.run(self._prepare_session(persona))
+            print(f"\n📋 GENERATED {len(tasks)} TASKS")
             
-            self._execute_task(task, persona)
+            input(f"\n⏯️  Press Enter to start {persona.name}'s AI-driven shopping session...")
             
-            if i < len(tasks):
-                print(f"🔄 Refreshing browser for next task...")
-                self.automation.driver.refresh()
-                time.sleep(3)
-        
-        print(f"\n🎉 ALL TASKS COMPLETED FOR {persona.name}!")
-        print(f"📊 Final Stats:")
-        print(f"  🎬 Actions: {self.automation.stats['actions']}")
-        print(f"  ✅ Success Rate: {(self.automation.stats['success']/max(self.automation.stats['actions'],1)*100):.1f}%")
-        print(f"  🛒 Cart Items: {self.automation.stats['cart_items']}")
-        
-        self.automation.cleanup()
+            for i, task in enumerate(tasks, 1):
+                self._emit(
+                    f"\n{'='*60}",
+                    f"🎯 EXECUTING TASK {i}: {task.task_name}",
+                    f"📝 Goal: {task.description}",
+                    f"{'='*60}"
+                )
+                
+                self._execute_task(task, persona)
+                
+                if i < len(tasks):
+                    self.automation.reset_for_next_task()
+            
+            stats = self.automation.stats
+            self._emit(
+                f"\n🎉 ALL TASKS COMPLETED FOR {persona.name}!",
+                f"📊 Final Stats:",
+                f"  🎬 Actions: {stats.actions}",
+                f"  ✅ Success Rate: {stats.success_rate:.1%}",
+                f"  🛒 Cart Items: {stats.cart_items}"
+            )
+        finally:
+            self.automation.cleanup()
+    
+    @staticmethod
+    def _emit(*lines):
+        """Writes a block of output lines with a single write so it is never split up."""
+        sys.stdout.write("\n".join(lines) + "\n")
+    
+    async def _prepare_session(self, persona: CustomPersona) -> List[LLMTask]:
+        """Generates tasks while Chrome starts up, overlapping the LLM call with browser launch."""
+        tasks, _ = await asyncio.gather(
+            asyncio.to_thread(self._generate_and_show_tasks, persona),
+            asyncio.to_thread(self.automation.setup_browser)
+        )
+        return tasks
+    
+    def _generate_and_show_tasks(self, persona: CustomPersona) -> List[LLMTask]:
+        """Prints each task the moment it is generated and returns the full list."""
+        tasks = []
+        for i, task in enumerate(self.task_engine.stream_shopping_tasks(persona), 1):
+            # One write per task keeps its lines together while the browser thread logs
+            self._emit(*self._format_task(i, task))
+            tasks.append(task)
+        return tasks
+    
+    @staticmethod
+    def _format_task(index: int, task: LLMTask) -> List[str]:
+        """Returns the display lines for one generated task."""
+        return [
+            f"  {index}. {task.task_name}",
+            f"     📝 {task.description}",
+            f"     🔧 Functions: {', '.join(task.expected_functions)}",
+            f"     🎯 Success: {task.success_criteria}",
+            f"     😊 Journey: {' → '.join(task.emotional_journey)}"
+        ]
     
     def _execute_task(self, task: LLMTask, persona: CustomPersona):
         """Executes individual task by mapping function names to automation methods."""
@@ -708,7 +1286,7 @@ class InteractiveDemo:
                 print(f"\n🔄 Executing: {function_name}")
                 
                 if function_name == "search_products":
-                    search_term = self._get_intelligent_search_term(persona)
+                    search_term = task.search_term or self._get_intelligent_search_term(persona)
                     result = self.automation.search_products(persona, search_term)
                 elif function_name == "extract_products":
                     result = self.automation.extract_products(persona)
@@ -727,7 +1305,9 @@ class InteractiveDemo:
                 if not result.get('success'):
                     print(f"⚠️ Function {function_name} failed: {result.get('error', 'Unknown error')}")
                 
-                time.sleep(1)
+                self.automation.wait_for_page_ready()
+                if self.inter_action_delay:
+                    time.sleep(self.inter_action_delay)
                 
             except Exception as e:
                 print(f"❌ Task execution failed: {e}")
@@ -735,16 +1315,16 @@ class InteractiveDemo:
     
     def _get_intelligent_search_term(self, persona: CustomPersona):
         """Generates contextually appropriate search terms based on persona attributes."""
-        combined_interests = persona.interests + persona.shopping_goals
-        
-        if persona.decision_style == "price_focused":
-            return f"affordable {random.choice(combined_interests)}"
-        elif persona.type == PersonaType.LUXURY_BUYER:
-            return f"premium {random.choice(combined_interests)}"
-        elif "trending" in " ".join(persona.personality_traits).lower():
-            return f"trending {random.choice(combined_interests)}"
-        else:
-            return random.choice(combined_interests)
+        prefix, candidates = _search_term_profile(
+            persona.decision_style,
+            persona.type,
+            persona.traits_set,
+            tuple(persona.interests),
+            tuple(persona.shopping_goals)
+        )
+        
+        term = random.choice(candidates)
+        return f"{prefix} {term}" if prefix else term
 
 
 # ===========================================
@@ -753,6 +1333,26 @@ class InteractiveDemo:
 
 def main():
     """Main entry point for interactive LLM-driven automation demo."""
+    parser = argparse.ArgumentParser(description="Interactive LLM-driven automation demo")
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="generate fresh tasks instead of replaying cached ones for the same persona"
+    )
+    parser.add_argument(
+        "--semantic-cache",
+        action="store_true",
+        help="also replay cached tasks for near-identical personas, matched by embedding similarity"
+    )
+    parser.add_argument(
+        "--profile-dir",
+        nargs="?",
+        const=TiraAutomation.DEFAULT_PROFILE_DIR,
+        default=None,
+        help="reuse a persistent Chrome profile (default location: %(const)s); one run at a time per profile"
+    )
+    args = parser.parse_args()
+    
     print("🤖 INTERACTIVE LLM-DRIVEN AUTOMATION SYSTEM")
     print("="*50)
     print("Create custom personas and watch LLM generate + execute tasks!")
@@ -761,7 +1361,12 @@ def main():
     choice = input("🎭 Create custom persona and run demo? (y/n): ").lower()
     
     if choice == 'y':
-        demo = InteractiveDemo(use_openai=True)
+        demo = InteractiveDemo(
+            use_openai=True,
+            use_cache=not args.no_cache,
+            semantic_cache=args.semantic_cache,
+            profile_dir=args.profile_dir
+        )
         demo.run_interactive_session()
     else:
         print("🚀 Interactive system ready when you are!")